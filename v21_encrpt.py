@@ -8,14 +8,16 @@ Schema now only contains:
 - Extra Income (extra)
 - Food & Drinks (food)
 - Other Spending (other)
-- Note (note) -- encrypted at field-level
-- Tags (tags) -- encrypted at field-level
+- Note (note) -- encrypted at field-level, together with the tags in one payload
+- Tags (tags) -- travels inside the note payload (column only filled on legacy rows)
 
 Features:
 - SQLite DB + CSV + Excel sync
-- PBKDF2-HMAC-SHA256 passphrase support (env FINANCE_PASSPHRASE) or fallback secret.key
+- scrypt passphrase support (env FINANCE_PASSPHRASE) or fallback secret.key
+  (installs created with PBKDF2-HMAC-SHA256 keep deriving with it)
 - Field-level encryption (Fernet) for note & tags
 - Encrypted artifacts saved on disk: CSV.enc, XLSX.enc, DB dump .enc, STATE.enc
+  (CSV and DB dump are stream-encrypted in chunked AES-GCM records)
 - Backup rotation and encrypted backups
 - Charts (daily bar and period line charts) and tag cloud
 - Flask web UI: dashboard, add, charts, search, analytics, exports
@@ -28,33 +30,91 @@ from __future__ import annotations
 import os
 import io
 import sys
+import csv
 import json
+import mmap
+import errno
+import re
 import stat
+import time
+import atexit
+import threading
 import tarfile
 import shutil
 import sqlite3
+import tempfile
 import base64
+import uuid
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # charts are only ever saved to disk; skip GUI backend init
 import matplotlib.pyplot as plt
 from wordcloud import WordCloud
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
 from flask import Flask, render_template_string, request, redirect, send_file, url_for, abort
 from markupsafe import Markup
-from colorama import Fore, init as colorama_init
+from colorama import Fore, Style, init as colorama_init
 
 # cryptography
 from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+from cryptography.hazmat.primitives import hashes, hmac
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.exceptions import InvalidSignature
+
+# optional Rust Fernet (same token format, much faster on tiny payloads)
+try:
+    from rfernet import Fernet as _RFernet
+except ImportError:
+    _RFernet = None
+
+# optional Aho-Corasick automaton for auto_tag
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# optional JIT for the analytics kernel; without numba it runs as plain NumPy
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+# optional write-only Excel engine for the plain XLSX export
+try:
+    import xlsxwriter
+    EXCEL_ENGINE = "xlsxwriter"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+# optional multithreaded CSV parser and Parquet cache for load_df
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pa_csv = pq = None
 
 # -----------------------------------------------------------------------------
 # Initialization
 # -----------------------------------------------------------------------------
-colorama_init(autoreset=True)
+# colorama's stdout wrapper (re-parsing every write) is only needed to translate ANSI on
+# Windows consoles; elsewhere log() writes the codes itself, and only to a terminal
+if sys.platform == "win32":
+    colorama_init(autoreset=True)
+_LOG_COLOR = sys.platform == "win32" or bool(sys.stdout and sys.stdout.isatty())
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
 # -----------------------------------------------------------------------------
@@ -70,6 +130,9 @@ DB_FILE = os.path.join(DATA_DIR, "finance.db")
 CSV_FILE = os.path.join(DATA_DIR, "daily_finance_tracker.csv")
 EXCEL_FILE = os.path.join(DATA_DIR, "daily_finance_tracker.xlsx")
 STATE_FILE = os.path.join(DATA_DIR, "finance_state.json")
+EXCEL_DIRTY_FILE = os.path.join(DATA_DIR, ".excel_dirty")   # sidecar: EXCEL_FILE lags the CSV
+LAST_EXPORT_FILE = os.path.join(DATA_DIR, ".last_export_rowcount")   # "max_rowid,count" at last export
+PARQUET_FILE = os.path.join(DATA_DIR, "finance.parquet")     # columnar read cache of the CSV
 
 # Encrypted artifacts (at-rest encrypted)
 CSV_ENC = os.path.join(DATA_DIR, "daily_finance_tracker.csv.enc")
@@ -87,6 +150,7 @@ DAILY_FOLDER = os.path.join(CHARTS_FOLDER, "daily")
 MONTHLY_FOLDER = os.path.join(CHARTS_FOLDER, "monthly")
 YEARLY_FOLDER = os.path.join(CHARTS_FOLDER, "yearly")
 TAGCLOUD_FOLDER = os.path.join(CHARTS_FOLDER, "tag_cloud")
+TAG_CLOUD_FILE = os.path.join(TAGCLOUD_FOLDER, "tag_cloud.png")
 BACKUP_FOLDER = os.path.join(DATA_DIR, "backup")
 for p in [CHARTS_FOLDER, DAILY_FOLDER, MONTHLY_FOLDER, YEARLY_FOLDER, TAGCLOUD_FOLDER, BACKUP_FOLDER]:
     os.makedirs(p, exist_ok=True)
@@ -96,6 +160,14 @@ app = Flask(__name__)
 
 # Other settings
 BACKUP_RETENTION = 20
+FLUSH_DELAY_SECONDS = 5        # encrypted artifacts/backups are written this long after the last entry
+FLUSH_MAX_DELAY_SECONDS = 60   # ...but never postponed longer than this under steady writes
+TAG_CLOUD_EVERY = 20           # redraw the tag cloud every N entries
+EXPORT_JOB_TTL_SECONDS = 600   # a secure export (job and tarball) is dropped this long after it finished
+EXPORT_MAX_PENDING = 4         # queued/running secure exports; further requests get 429
+STREAM_CHUNK = 64 * 1024       # plaintext bytes per AES-GCM record in streamed artifacts
+KDF_ITERATIONS = 390000        # PBKDF2, legacy salt files only
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2**15, 8, 1
 DATE_FMT = "%Y-%m-%d"
 
 # CSV schema (note: "Additional Income" and "Starting Balance" removed per request)
@@ -116,7 +188,7 @@ CSV_COLUMNS = [
 # Utility helpers
 # -----------------------------------------------------------------------------
 def log(msg: str, color=Fore.GREEN):
-    print(color + msg)
+    print(color + msg + Style.RESET_ALL if _LOG_COLOR else msg)
 
 def safe_int(x, default=0):
     try:
@@ -131,25 +203,105 @@ def ensure_dirs():
 ensure_dirs()
 
 # -----------------------------------------------------------------------------
-# Crypto utilities (PBKDF2 passphrase or fallback file key)
+# Crypto utilities (scrypt/PBKDF2 passphrase or fallback file key)
 # -----------------------------------------------------------------------------
-def _write_file_secure(path: str, data: bytes):
-    with open(path, "wb") as f:
-        f.write(data)
+def _chmod_private(path: str):
     try:
         os.chmod(path, stat.S_IRUSR | stat.S_IWUSR)  # 0o600
     except Exception:
         pass
 
+_DIRECT_ALIGN = 4096
+
+def _sync_and_drop(fd: int):
+    # data and size on disk, then out of the page cache: artifacts are only read back by an
+    # export, so they shouldn't evict hot SQLite pages
+    os.fsync(fd)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _mkstemp_part(path: str) -> Tuple[int, str]:
+    # unique <name>.XXXX.part next to path (same filesystem, so os.replace stays atomic),
+    # created 0o600; concurrent writers of one artifact never share a temp file
+    d, name = os.path.split(path)
+    return tempfile.mkstemp(prefix=name + ".", suffix=".part", dir=d or ".")
+
+def _write_file_secure(path: str, data: bytes):
+    # written to a unique .part file and renamed over path, so readers (send_file, backups) never
+    # see a half-written artifact. Durable when it returns (O_DSYNC); O_DIRECT also keeps it out of
+    # the page cache. Filesystems that refuse O_DIRECT (tmpfs, some network mounts) get O_DSYNC only.
+    fd, tmp = _mkstemp_part(path)
+    os.close(fd)   # reopened below with the O_DSYNC/O_DIRECT flags
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0) | getattr(os, "O_DSYNC", 0)
+    try:
+        if hasattr(os, "O_DIRECT"):
+            try:
+                _write_fd(tmp, flags | os.O_DIRECT, data, direct=True)
+            except OSError as e:
+                if e.errno != errno.EINVAL:
+                    raise
+                _write_fd(tmp, flags, data, direct=False)
+        else:
+            _write_fd(tmp, flags, data, direct=False)
+    except BaseException:
+        _remove_quietly(tmp)
+        raise
+    os.replace(tmp, path)
+
+def _write_all(fd: int, data: bytes):
+    mv = memoryview(data)
+    while mv:
+        mv = mv[os.write(fd, mv):]
+
+def _write_fd(path: str, flags: int, data: bytes, direct: bool):
+    # new files are created 0o600 by open() itself and existing ones are tightened before
+    # any byte lands; then unbuffered writes of the whole buffer
+    fd = os.open(path, flags, 0o600)
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o600)
+        if not direct:
+            _write_all(fd, data)
+        else:
+            # O_DIRECT wants page-aligned memory and block-sized writes: copy into an anonymous
+            # mmap padded to 4 KiB, write that, then cut the file back to the real length
+            n = len(data)
+            size = -(-n // _DIRECT_ALIGN) * _DIRECT_ALIGN
+            if size:
+                with mmap.mmap(-1, size) as buf:
+                    buf[:n] = data
+                    written = os.write(fd, buf)
+                    while written < size:
+                        written += os.write(fd, buf[written:])
+                os.ftruncate(fd, n)
+        _sync_and_drop(fd)
+    finally:
+        os.close(fd)
+
+# kdf_salt.bin holds either a bare 16-byte salt (legacy PBKDF2 installs) or a
+# version byte followed by the salt. The KDF is fixed per install: switching an
+# existing install would change the key and orphan everything encrypted under it.
+KDF_VERSION_SCRYPT = b"\x02"
+
 def _load_or_create_salt() -> bytes:
     if os.path.exists(KDF_SALT_FILE):
         return open(KDF_SALT_FILE, "rb").read()
-    salt = os.urandom(16)
+    salt = KDF_VERSION_SCRYPT + os.urandom(16)
     _write_file_secure(KDF_SALT_FILE, salt)
     return salt
 
 def _derive_key_from_passphrase(passphrase: str) -> bytes:
-    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=_load_or_create_salt(), iterations=390000)
+    blob = _load_or_create_salt()
+    if len(blob) == 17 and blob[:1] == KDF_VERSION_SCRYPT:
+        kdf = Scrypt(salt=blob[1:], length=32, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    else:
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=blob, iterations=KDF_ITERATIONS)
     return base64.urlsafe_b64encode(kdf.derive(passphrase.encode("utf-8")))
 
 def _load_or_create_filekey() -> bytes:
@@ -159,7 +311,23 @@ def _load_or_create_filekey() -> bytes:
     _write_file_secure(SECRET_KEY_FILE, key)
     return key
 
-def get_cipher() -> Fernet:
+class _RustFernet:
+    # rfernet speaks str tokens; keep the bytes-in/bytes-out API of cryptography's Fernet
+    def __init__(self, key: bytes):
+        self._f = _RFernet(key.decode("ascii"))
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self._f.encrypt(data).encode("ascii")
+
+    def decrypt(self, token) -> bytes:
+        if isinstance(token, (bytes, bytearray, memoryview)):
+            token = bytes(token).decode("ascii")
+        try:
+            return self._f.decrypt(token)
+        except Exception:
+            raise InvalidToken
+
+def _load_data_key() -> bytes:
     passphrase = os.environ.get("FINANCE_PASSPHRASE")
     if passphrase is not None and passphrase.strip() == "":
         passphrase = None
@@ -167,21 +335,159 @@ def get_cipher() -> Fernet:
         key = _derive_key_from_passphrase(passphrase)
     else:
         key = _load_or_create_filekey()
+    return key
+
+def get_cipher(key: Optional[bytes] = None) -> Fernet:
+    if key is None:
+        key = _load_data_key()
+    if _RFernet is not None:
+        return _RustFernet(key)
     return Fernet(key)
 
-CIPHER = get_cipher()
+def _derive_stream_key(key: bytes) -> bytes:
+    # AES-256 key for streamed artifacts, bound to the same Fernet key material
+    h = hashes.Hash(hashes.SHA256())
+    h.update(b"v21-artifact-stream")
+    h.update(base64.urlsafe_b64decode(key))
+    return h.finalize()
+
+_DATA_KEY = _load_data_key()
+CIPHER = get_cipher(_DATA_KEY)
+STREAM_KEY = _derive_stream_key(_DATA_KEY)
+STREAM_AEAD = AESGCM(STREAM_KEY)   # stateless per call, shared by every artifact read/write
+
+# Streamed artifact format (v2), written chunk by chunk so large dumps never sit in RAM whole:
+#   header line | 7-byte nonce prefix | records of (4-byte BE length, AES-GCM ciphertext+tag)
+# Record nonce = prefix + 4-byte counter + final flag; the header is the associated data,
+# so reordering, truncation and header tampering all fail authentication.
+_STREAM_MAGIC = b'{"v":2,"alg":"AESGCM"}\n'
+
+def _stream_nonce(prefix: bytes, counter: int, last: bool) -> bytes:
+    return prefix + counter.to_bytes(4, "big") + (b"\x01" if last else b"\x00")
+
+def _iter_file_chunks(path: str, size: int = STREAM_CHUNK) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(size)
+            if not chunk:
+                return
+            yield chunk
+
+class _StreamEncryptor(io.RawIOBase):
+    # writable file object producing a v2 streamed artifact at path (via a .part file, renamed on
+    # a clean close, which also writes the final record); leaving the with-block on an
+    # exception drops the partial file and leaves any previous artifact in place
+    def __init__(self, path: str):
+        super().__init__()
+        self._path = path
+        self._prefix = os.urandom(7)
+        self._counter = 0
+        self._pos = 0   # plaintext bytes accepted so far (tarfile asks for tell())
+        self._buf = bytearray()
+        fd, self._tmp = _mkstemp_part(path)
+        self._f = os.fdopen(fd, "wb")
+        self._f.write(_STREAM_MAGIC + self._prefix)
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def _record(self, data: bytes, last: bool):
+        ct = STREAM_AEAD.encrypt(_stream_nonce(self._prefix, self._counter, last), data, _STREAM_MAGIC)
+        self._f.write(len(ct).to_bytes(4, "big") + ct)
+        self._counter += 1
+
+    def write(self, b) -> int:
+        n = memoryview(b).nbytes
+        self._pos += n
+        self._buf += b
+        while len(self._buf) > STREAM_CHUNK:
+            self._record(bytes(self._buf[:STREAM_CHUNK]), False)
+            del self._buf[:STREAM_CHUNK]
+        return n
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._record(bytes(self._buf), True)
+            self._f.flush()
+            _sync_and_drop(self._f.fileno())
+            self._f.close()
+            _chmod_private(self._tmp)
+            os.replace(self._tmp, self._path)
+        except BaseException:
+            self._f.close()
+            _remove_quietly(self._tmp)
+            raise
+        finally:
+            super().close()
+
+    def abort(self):
+        if self.closed:
+            return
+        self._f.close()
+        _remove_quietly(self._tmp)
+        super().close()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+def _write_encrypted_stream(path: str, chunks: Iterable[bytes]):
+    with _StreamEncryptor(path) as enc:
+        for chunk in chunks:
+            enc.write(chunk)
+
+def _iter_decrypted_stream(data) -> Iterator[bytes]:
+    # the views are released on the way out, error or not, so a caller can unmap data (an
+    # mmap) right away even while a failed decrypt's traceback still references this frame
+    mv = memoryview(data)
+    ct = None
+    try:
+        pos = len(_STREAM_MAGIC)
+        prefix = bytes(mv[pos:pos + 7])
+        pos += 7
+        counter = 0
+        while True:
+            if pos + 4 > len(mv):
+                raise InvalidToken("truncated artifact stream")
+            n = int.from_bytes(mv[pos:pos + 4], "big")
+            ct = mv[pos + 4:pos + 4 + n]
+            pos += 4 + n
+            last = pos >= len(mv)
+            yield STREAM_AEAD.decrypt(_stream_nonce(prefix, counter, last), ct, _STREAM_MAGIC)
+            ct.release()
+            if last:
+                return
+            counter += 1
+    finally:
+        if ct is not None:
+            ct.release()
+        mv.release()
 
 def enc_bytes(b: bytes) -> bytes:
-    return CIPHER.encrypt(b)
+    # one-shot v2 artifact (same records as _StreamEncryptor): AES-GCM under the cached
+    # context instead of Fernet's CBC + HMAC + base64 of the whole blob
+    mv = memoryview(b)
+    prefix = os.urandom(7)
+    n = max(1, -(-len(mv) // STREAM_CHUNK))
+    out = [_STREAM_MAGIC + prefix]
+    for i in range(n):
+        ct = STREAM_AEAD.encrypt(_stream_nonce(prefix, i, i == n - 1), mv[i * STREAM_CHUNK:(i + 1) * STREAM_CHUNK], _STREAM_MAGIC)
+        out.append(len(ct).to_bytes(4, "big") + ct)
+    return b"".join(out)
 
 def dec_bytes(b: bytes) -> bytes:
+    # accepts both Fernet tokens and v2 streamed artifacts
+    if bytes(b[:len(_STREAM_MAGIC)]) == _STREAM_MAGIC:
+        return b"".join(_iter_decrypted_stream(b))
     return CIPHER.decrypt(b)
 
-def enc_text(s: Optional[str]) -> str:
-    if s is None or s == "":
-        return ""
-    return CIPHER.encrypt(s.encode("utf-8")).decode("utf-8")
-
 def dec_text(s: Optional[str]) -> str:
     if s is None or s == "":
         return ""
@@ -191,101 +497,289 @@ def dec_text(s: Optional[str]) -> str:
         # fallback to plaintext if decryption fails
         return s
 
+def enc_fields(d: dict) -> bytes:
+    # one Fernet token for all text fields of a row (note + tags), kept as raw bytes for a BLOB
+    return CIPHER.encrypt(json.dumps(d, separators=(",", ":")).encode("utf-8"))
+
+def _bulk_dec(tokens: Iterable) -> List[str]:
+    # dec_text over many tokens (str or bytes): the HMAC key and AES key schedule are set up
+    # once, each token is then base64 + HMAC verify (copied context) + AES-CBC + unpad
+    if not isinstance(CIPHER, Fernet):
+        return [_dec_token(t) for t in tokens]
+    base_mac = hmac.HMAC(CIPHER._signing_key, hashes.SHA256())
+    aes = algorithms.AES(CIPHER._encryption_key)
+    out = []
+    for t in tokens:
+        if not t:
+            out.append("")
+            continue
+        raw = t if isinstance(t, bytes) else t.encode("utf-8")
+        try:
+            # 0x80 | 8-byte timestamp | 16-byte IV | ciphertext | 32-byte HMAC
+            data = base64.urlsafe_b64decode(raw)
+            if len(data) < 73 or data[0] != 0x80:
+                raise InvalidToken
+            mac = base_mac.copy()
+            mac.update(data[:-32])
+            mac.verify(data[-32:])
+            d = Cipher(aes, modes.CBC(data[9:25])).decryptor()
+            padded = d.update(data[25:-32]) + d.finalize()
+            n = padded[-1]
+            if not 1 <= n <= 16 or padded[-n:] != bytes([n]) * n:
+                raise InvalidToken
+            out.append(padded[:-n].decode("utf-8"))
+        except (InvalidToken, InvalidSignature, ValueError):
+            out.append(raw.decode("utf-8", errors="replace"))
+    return out
+
+def _dec_token(t) -> str:
+    if isinstance(t, bytes):
+        try:
+            return CIPHER.decrypt(t).decode("utf-8")
+        except (InvalidToken, ValueError):
+            return t.decode("utf-8", errors="replace")
+    return dec_text(t)
+
+def _split_fields(plain: str, tags_cell: Optional[str] = None) -> Tuple[str, str]:
+    # plain: the decrypted note cell -> (note, tags); legacy str-token rows keep tags
+    # in a second token in tags_cell
+    if plain.startswith("{"):
+        try:
+            d = json.loads(plain)
+            if isinstance(d, dict) and "note" in d:
+                return d.get("note") or "", d.get("tags") or ""
+        except ValueError:
+            pass
+    return plain, dec_text(tags_cell)
+
 # -----------------------------------------------------------------------------
 # Database initialization & migration
 # -----------------------------------------------------------------------------
+# One shared autocommit connection (WAL, no fsync per commit) for the whole app;
+# Flask threads and the flush timer serialize on _DB_LOCK. Closed at exit.
+_DB = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=None)
+_DB.execute("PRAGMA journal_mode=WAL")
+_DB.execute("PRAGMA synchronous=NORMAL")
+_DB.execute("PRAGMA temp_store=MEMORY")
+_DB.execute("PRAGMA cache_size=-20000")
+_DB_LOCK = threading.Lock()
+atexit.register(_DB.close)
+
+def _rollback_if_open():
+    # a failed script can leave a transaction open on the shared connection
+    if _DB.in_transaction:
+        _DB.execute("ROLLBACK")
+
 def create_db():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS finance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT,
-            pocket INTEGER,
-            extra INTEGER,
-            total_income INTEGER,
-            food INTEGER,
-            other INTEGER,
-            total_spent INTEGER,
-            balance INTEGER,
-            note TEXT,
-            tags TEXT,
-            created_at TEXT
-        )
-    ''')
-    # migration safety: try to add missing columns
-    try:
-        c.execute("ALTER TABLE finance ADD COLUMN total_income INTEGER DEFAULT 0")
-    except Exception:
-        pass
-    try:
-        c.execute("ALTER TABLE finance ADD COLUMN total_spent INTEGER DEFAULT 0")
-    except Exception:
-        pass
-    try:
-        c.execute("ALTER TABLE finance ADD COLUMN created_at TEXT")
-    except Exception:
-        pass
-    conn.commit()
-    conn.close()
+    with _DB_LOCK:
+        c = _DB.cursor()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS finance (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT,
+                pocket INTEGER,
+                extra INTEGER,
+                total_income INTEGER,
+                food INTEGER,
+                other INTEGER,
+                total_spent INTEGER,
+                balance INTEGER,
+                note BLOB,
+                tags BLOB,
+                created_at TEXT
+            )
+        ''')
+        # migration safety: try to add missing columns
+        try:
+            c.execute("ALTER TABLE finance ADD COLUMN total_income INTEGER DEFAULT 0")
+        except Exception:
+            pass
+        try:
+            c.execute("ALTER TABLE finance ADD COLUMN total_spent INTEGER DEFAULT 0")
+        except Exception:
+            pass
+        try:
+            c.execute("ALTER TABLE finance ADD COLUMN created_at TEXT")
+        except Exception:
+            pass
 
 create_db()
 
 # -----------------------------------------------------------------------------
 # State (plain JSON + encrypted copy)
 # -----------------------------------------------------------------------------
-def load_state() -> Tuple[int,int]:
+def _state_tuple(data: dict) -> Tuple[int,int,Optional[dict]]:
+    counts = data.get("tag_counts")
+    # counts are stamped with the CSV signature they describe; any other CSV version means rows
+    # were added (or rebuilt) since, so they are stale
+    sig = _csv_signature()
+    if sig is None or data.get("tag_counts_csv") != list(sig):
+        counts = None
+    return (int(data.get("day_index", 0)), int(data.get("balance_rollover", 0)),
+            dict(counts) if isinstance(counts, dict) else None)
+
+def load_state() -> Tuple[int,int,Optional[dict]]:
+    # -> (day_index, balance_rollover, tag_counts); tag_counts is None if never recorded or
+    # recorded for another version of the CSV
     # try plaintext state
     if os.path.exists(STATE_FILE):
         try:
             with open(STATE_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return int(data.get("day_index", 0)), int(data.get("balance_rollover", 0))
+                return _state_tuple(json.load(f))
         except Exception:
             pass
     # try encrypted
     if os.path.exists(STATE_ENC):
         try:
             raw = dec_bytes(open(STATE_ENC, "rb").read())
-            data = json.loads(raw.decode("utf-8"))
-            return int(data.get("day_index", 0)), int(data.get("balance_rollover", 0))
+            return _state_tuple(json.loads(raw.decode("utf-8")))
         except Exception:
             pass
-    return 0, 0
-
-def save_state(day_index: int, balance_rollover: int):
+    return 0, 0, None
+
+def save_state(day_index: int, balance_rollover: int, tag_counts: Optional[dict] = None,
+               csv_sig: Optional[Tuple[int, int]] = None):
+    data = {"day_index": day_index, "balance_rollover": balance_rollover}
+    if tag_counts is not None and csv_sig is not None:
+        data["tag_counts"] = tag_counts
+        data["tag_counts_csv"] = list(csv_sig)
     try:
         with open(STATE_FILE, "w", encoding="utf-8") as f:
-            json.dump({"day_index": day_index, "balance_rollover": balance_rollover}, f)
+            json.dump(data, f)
     except Exception:
         pass
-    blob = json.dumps({"day_index": day_index, "balance_rollover": balance_rollover}).encode("utf-8")
+    blob = json.dumps(data).encode("utf-8")
     _write_file_secure(STATE_ENC, enc_bytes(blob))
 
+# running tag frequencies for the tag cloud, so it never rescans the history. Kept in memory
+# and bumped per save; written to state by the deferred flush, not per entry. save_entries
+# holds the lock across its CSV append and the bump, so a seed from the CSV sees each row
+# either in the file or in a later bump, never both. Reentrant: a seed may rebuild the CSV.
+_TAG_COUNTS_LOCK = threading.RLock()
+_TAG_COUNTS: Optional[Counter] = None
+_TAG_COUNTS_DIRTY = False
+
+def _tag_counts_locked() -> Counter:
+    global _TAG_COUNTS
+    if _TAG_COUNTS is None:
+        counts = load_state()[2]
+        if counts is None:
+            # nothing recorded for this CSV version: seed from the CSV
+            counts = Counter(t for tags in load_df()["Tags"].dropna().astype(str) for t in tags.split())
+        _TAG_COUNTS = Counter(counts)
+    return _TAG_COUNTS
+
+def tag_counts() -> dict:
+    with _TAG_COUNTS_LOCK:
+        return dict(_tag_counts_locked())
+
+def _update_tag_counts(entries: List[tuple]):
+    # counts not loaded yet are left alone: the seed will find these rows in the CSV
+    global _TAG_COUNTS_DIRTY
+    with _TAG_COUNTS_LOCK:
+        if _TAG_COUNTS is None:
+            return
+        for e in entries:
+            _TAG_COUNTS.update((e[9] or "").split())
+        _TAG_COUNTS_DIRTY = True
+
+def _reset_tag_counts():
+    # the CSV was rebuilt or the DB replaced: forget the counts, in memory and in state, so
+    # they are seeded again from the current data
+    global _TAG_COUNTS, _TAG_COUNTS_DIRTY
+    with _TAG_COUNTS_LOCK:
+        _TAG_COUNTS = None
+        _TAG_COUNTS_DIRTY = False
+        day_index, rollover, _ = load_state()
+        save_state(day_index, rollover)
+
+def _persist_tag_counts():
+    global _TAG_COUNTS_DIRTY
+    with _TAG_COUNTS_LOCK:
+        if not _TAG_COUNTS_DIRTY:
+            return
+        counts = dict(_TAG_COUNTS)
+        sig = _csv_signature()   # the CSV these counts describe (appends hold the lock)
+        _TAG_COUNTS_DIRTY = False
+    try:
+        day_index, rollover, _ = load_state()
+        save_state(day_index, rollover, counts, sig)
+    except BaseException:
+        with _TAG_COUNTS_LOCK:
+            _TAG_COUNTS_DIRTY = True   # retried on the next flush
+        raise
+
 # -----------------------------------------------------------------------------
 # CSV / Excel helpers (and encrypted copies)
 # -----------------------------------------------------------------------------
-def _append_to_csv(row_dict: dict):
-    cols = CSV_COLUMNS
-    df = pd.DataFrame([row_dict], columns=cols)
-    if os.path.exists(CSV_FILE):
-        try:
-            current = pd.read_csv(CSV_FILE)
-            missing = [c for c in cols if c not in current.columns]
-            if missing:
-                log("CSV missing columns. Rebuilding CSV from DB…", Fore.YELLOW)
-                rebuild_csv_from_db()
-            df.to_csv(CSV_FILE, mode='a', header=False, index=False)
-        except Exception:
-            rebuild_csv_from_db()
-            df.to_csv(CSV_FILE, mode='a', header=False, index=False)
-    else:
-        df.to_csv(CSV_FILE, index=False)
+def _mark_excel_dirty():
+    # EXCEL_FILE is rebuilt lazily from the CSV on /export/excel
+    try:
+        open(EXCEL_DIRTY_FILE, "w").close()
+    except Exception:
+        pass
+
+def _clear_excel_dirty():
+    try:
+        os.remove(EXCEL_DIRTY_FILE)
+    except FileNotFoundError:
+        pass
+
+def _write_excel(df: pd.DataFrame, target):
+    # target: path or binary file object; both engines stream rows without per-cell pandas boxing
+    df = df.reindex(columns=CSV_COLUMNS)
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    if EXCEL_ENGINE == "xlsxwriter":
+        # constant_memory flushes each row as it is finished; rows must go out in order, which
+        # rules out df.to_excel (it writes column by column)
+        wb = xlsxwriter.Workbook(target, {"constant_memory": True})
+        ws = wb.add_worksheet("Daily_Records")
+        ws.write_row(0, 0, CSV_COLUMNS)
+        for i, row in enumerate(rows, start=1):
+            ws.write_row(i, 0, row)
+        wb.close()
+        return
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Daily_Records")
+    ws.append(CSV_COLUMNS)
+    for row in rows:
+        ws.append(row)
+    wb.save(target)
+
+def _mtime_ns(path: str) -> Optional[int]:
+    # one stat; None when the file is missing
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _is_stale(target: str, source: str) -> bool:
+    t = _mtime_ns(target)
+    if t is None:
+        return True
+    s = _mtime_ns(source)
+    return s is not None and t <= s
+
+def _csv_header_ok() -> bool:
+    # only the first line is read; the body is never parsed on the append path
+    try:
+        with open(CSV_FILE, "r", encoding="utf-8", newline="") as f:
+            return next(csv.reader([f.readline()]), []) == CSV_COLUMNS
+    except Exception:
+        return False
+
+def _append_to_csv(rows: List[tuple]):
+    # rows are plaintext tuples in CSV_COLUMNS order, already inserted in the DB
+    if not _csv_header_ok():
+        log("CSV missing or missing columns. Rebuilding CSV from DB…", Fore.YELLOW)
+        rebuild_csv_from_db()  # includes the new rows
+        return
+    with open(CSV_FILE, "a", encoding="utf-8", newline="") as f:
+        csv.writer(f, lineterminator=os.linesep).writerows(rows)
 
 def rebuild_csv_from_db():
     if not os.path.exists(DB_FILE):
         return
-    conn = sqlite3.connect(DB_FILE)
     q = """SELECT
               date as "Date",
               pocket as "Pocket Money",
@@ -299,61 +793,162 @@ def rebuild_csv_from_db():
               tags as "Tags"
            FROM finance
            ORDER BY date ASC, id ASC"""
-    df = pd.read_sql_query(q, conn)
-    conn.close()
-    # decrypt Note/Tags for CSV convenience
-    try:
-        if not df.empty:
-            df["Note"] = df["Note"].astype(str).apply(lambda x: dec_text(x))
-            df["Tags"] = df["Tags"].astype(str).apply(lambda x: dec_text(x))
-    except Exception:
-        pass
-    df.to_csv(CSV_FILE, index=False)
+    # 50k-row frames: each batch's Note cells are decrypted in one go and the frame is written
+    # by pandas' CSV writer; nullable Int64 keeps integers (and NULLs as empty cells) intact
+    int_cols = {c: "Int64" for c in CSV_COLUMNS[1:8]}
+    with open(CSV_FILE, "w", encoding="utf-8", newline="") as fh:
+        with _DB_LOCK:
+            first = True
+            for chunk in pd.read_sql_query(q, _DB, chunksize=50_000, dtype=int_cols):
+                fields = [_split_fields(plain, tags) for plain, tags in
+                          zip(_bulk_dec(chunk["Note"].tolist()), chunk["Tags"].tolist())]
+                chunk["Note"] = [f[0] for f in fields]
+                chunk["Tags"] = [f[1] for f in fields]
+                chunk.to_csv(fh, header=first, index=False, lineterminator=os.linesep)
+                first = False
+            if first:
+                fh.write(",".join(CSV_COLUMNS) + os.linesep)
+    _mark_excel_dirty()
+    _reset_tag_counts()
+
+# One writer per encrypted artifact at a time, whoever calls (flush timer, /export/db, the
+# export worker, restore). Separate locks, so the dump and the CSV/XLSX pair can still be
+# produced side by side.
+_CSV_ARTIFACTS_LOCK = threading.Lock()   # CSV_ENC + XLSX_ENC
+_DB_DUMP_LOCK = threading.Lock()         # DB_DUMP_ENC
 
 def persist_csv_and_excel_encrypted():
-    # Build DF
-    if os.path.exists(CSV_FILE):
-        try:
-            df = pd.read_csv(CSV_FILE)
-        except Exception:
-            rebuild_csv_from_db()
-            df = pd.read_csv(CSV_FILE) if os.path.exists(CSV_FILE) else pd.DataFrame(columns=CSV_COLUMNS)
-    else:
-        rebuild_csv_from_db()
-        df = pd.read_csv(CSV_FILE) if os.path.exists(CSV_FILE) else pd.DataFrame(columns=CSV_COLUMNS)
-    # Encrypted CSV
-    csv_buf = io.StringIO()
-    df.to_csv(csv_buf, index=False)
-    _write_file_secure(CSV_ENC, enc_bytes(csv_buf.getvalue().encode("utf-8")))
-    # Encrypted Excel
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Daily_Records"
-    ws.append(CSV_COLUMNS)
-    for _, r in df.iterrows():
-        ws.append([r.get(c, "") for c in CSV_COLUMNS])
-    xbuf = io.BytesIO()
-    wb.save(xbuf)
-    _write_file_secure(XLSX_ENC, enc_bytes(xbuf.getvalue()))
+    with _CSV_ARTIFACTS_LOCK:
+        # Build DF (load_df rebuilds the CSV from the DB when it is missing or broken)
+        df = load_df()
+        # Encrypted CSV, streamed from the file rather than re-serialized in memory
+        if os.path.exists(CSV_FILE):
+            _write_encrypted_stream(CSV_ENC, _iter_file_chunks(CSV_FILE))
+        else:
+            _write_encrypted_stream(CSV_ENC, [df.to_csv(index=False).encode("utf-8")])
+        # Encrypted Excel (only when the CSV moved on since the last one)
+        if not _is_stale(XLSX_ENC, CSV_FILE):
+            return
+        xbuf = io.BytesIO()
+        _write_excel(df, xbuf)
+        _write_file_secure(XLSX_ENC, enc_bytes(xbuf.getvalue()))
 
 # -----------------------------------------------------------------------------
 # DB dump persistence (encrypted)
 # -----------------------------------------------------------------------------
+_SQLITE_HEADER = b"SQLite format 3\x00"
+
 def persist_db_dump():
+    with _DB_DUMP_LOCK:
+        _persist_db_dump()
+
+def _persist_db_dump():
+    # own short-lived connection: a WAL reader sees the last committed snapshot without
+    # taking _DB_LOCK, so the dump doesn't hold up request threads
     conn = sqlite3.connect(DB_FILE)
-    dump = "\n".join(conn.iterdump()).encode("utf-8")
-    conn.close()
-    _write_file_secure(DB_DUMP_ENC, enc_bytes(dump))
+    try:
+        if sqlite3.sqlite_version_info < (3, 27, 0):
+            # no VACUUM INTO: the SQL text is encrypted line batch by line batch
+            _write_encrypted_stream(DB_DUMP_ENC, (line.encode("utf-8") + b"\n" for line in conn.iterdump()))
+            return
+        # VACUUM INTO: one C-level copy into a compacted database file (no free pages), which
+        # is then encrypted straight from disk; no SQL text now or to parse on restore.
+        # The target must be new or empty, so a fresh mkstemp file per dump does.
+        d, name = os.path.split(DB_FILE)
+        fd, snap = tempfile.mkstemp(prefix=name + ".", suffix=".snap", dir=d or ".")
+        os.close(fd)
+        try:
+            conn.execute("VACUUM INTO ?", (snap,))
+            _write_encrypted_stream(DB_DUMP_ENC, _iter_file_chunks(snap))
+        finally:
+            _remove_quietly(snap)
+    finally:
+        conn.close()
+
+def _restore_db(plain: bytes):
+    # plain: a database image (VACUUM INTO / serialize), or SQL text from an older dump.
+    # Images are page-copied into the live connection with backup(); DB_FILE can't simply be
+    # swapped underneath _DB, which stays open for the life of the process.
+    if not plain.startswith(_SQLITE_HEADER):
+        _restore_db_from_sql(plain.decode("utf-8", errors="ignore"))
+        return
+    image = bytearray(plain)
+    image[18] = image[19] = 1   # WAL image -> rollback journal, or deserialize refuses it
+    if hasattr(_DB, "deserialize"):
+        src = sqlite3.connect(":memory:")
+        src.deserialize(image)
+    else:
+        # Python < 3.11: go through a scratch file instead
+        tmp = DB_FILE + ".restore"
+        _write_file_secure(tmp, image)
+        src = sqlite3.connect(tmp)
+    try:
+        with _DB_LOCK:
+            src.backup(_DB)   # page copy; replaces the whole live database
+    finally:
+        src.close()
+        if not hasattr(_DB, "deserialize"):
+            os.remove(tmp)
+    _reset_tag_counts()
+
+_DUMP_INSERT = re.compile(r'INSERT INTO "?finance"? VALUES\((.*)\);', re.DOTALL)
+_SQL_VALUE = re.compile(r"'((?:[^']|'')*)'|X'([0-9A-Fa-f]*)'|([-+0-9.eE]+)|NULL")
+
+def _parse_sql_values(s: str) -> tuple:
+    # literals of one iterdump() VALUES(...) list: 'text', X'blob', numbers, NULL
+    out = []
+    for m in _SQL_VALUE.finditer(s):
+        text, blob, num = m.groups()
+        if text is not None:
+            out.append(text.replace("''", "'"))
+        elif blob is not None:
+            out.append(bytes.fromhex(blob))
+        elif num is not None:
+            out.append(float(num) if any(c in num for c in ".eE") else int(num))
+        else:
+            out.append(None)
+    return tuple(out)
+
+def _restore_db_from_sql(sql: str):
+    # finance rows are parsed out of their INSERTs and replayed with one executemany in one
+    # transaction; everything else (schema, sqlite_sequence) still goes through executescript
+    schema, rows, stmt = [], [], ""
+    for line in sql.splitlines(keepends=True):
+        stmt += line
+        if not sqlite3.complete_statement(stmt):
+            continue
+        s = stmt.strip()
+        stmt = ""
+        m = _DUMP_INSERT.fullmatch(s)
+        if m:
+            rows.append(_parse_sql_values(m.group(1)))
+        elif s.upper() not in ("BEGIN TRANSACTION;", "COMMIT;"):
+            schema.append(s)
+    with _DB_LOCK:
+        # restore only: no fsync and no WAL traffic for the bulk load
+        _DB.execute("PRAGMA synchronous=OFF")
+        _DB.execute("PRAGMA journal_mode=MEMORY")
+        try:
+            # the script's BEGIN stays open, so schema and rows commit together
+            _DB.executescript("BEGIN IMMEDIATE;\nDROP TABLE IF EXISTS finance;\n" + "\n".join(schema))
+            if rows:
+                _DB.executemany(f"INSERT INTO finance VALUES ({', '.join('?' * len(rows[0]))})", rows)
+            _DB.execute("COMMIT")
+        finally:
+            _rollback_if_open()
+            _DB.execute("PRAGMA journal_mode=WAL")
+            _DB.execute("PRAGMA synchronous=NORMAL")
+    _reset_tag_counts()
 
 def restore_from_db_dump_if_any():
     if not os.path.exists(DB_DUMP_ENC):
         return
+    # only seed an empty DB; a populated one is newer than any (deferred) dump
+    with _DB_LOCK:
+        if _DB.execute("SELECT 1 FROM finance LIMIT 1").fetchone():
+            return
     try:
-        sql = dec_bytes(open(DB_DUMP_ENC, "rb").read()).decode("utf-8", errors="ignore")
-        conn = sqlite3.connect(DB_FILE)
-        conn.executescript(sql)
-        conn.commit()
-        conn.close()
+        _restore_db(dec_bytes(open(DB_DUMP_ENC, "rb").read()))
         log("Restored DB from encrypted dump.", Fore.CYAN)
     except Exception as e:
         log(f"DB restore failed (continuing with empty DB): {e}", Fore.YELLOW)
@@ -370,58 +965,120 @@ def _rotate_backups(prefix: str):
             pass
 
 def backup_all():
-    ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    ts = time.strftime("%Y-%m-%d_%H-%M-%S")
     # persist latest artifacts
     persist_db_dump()
     persist_csv_and_excel_encrypted()
     def copy_enc(src: str, tag: str):
-        if os.path.exists(src):
-            try:
-                plain = dec_bytes(open(src, "rb").read())
-            except Exception:
-                with open(src, "rb") as f:
-                    plain = f.read()
-            out = os.path.join(BACKUP_FOLDER, f"{tag}_{ts}.enc")
-            _write_file_secure(out, enc_bytes(plain))
-            _rotate_backups(f"{tag}_")
+        # sources are already encrypted with the same key; copy the bytes as-is
+        out = os.path.join(BACKUP_FOLDER, f"{tag}_{ts}.enc")
+        try:
+            shutil.copyfile(src, out)
+        except FileNotFoundError:
+            return
+        _chmod_private(out)
+        _rotate_backups(f"{tag}_")
     copy_enc(DB_DUMP_ENC, "dbdump")
     copy_enc(CSV_ENC, "csv")
     copy_enc(XLSX_ENC, "excel")
     if os.path.exists(STATE_ENC):
         copy_enc(STATE_ENC, "state")
 
+# -----------------------------------------------------------------------------
+# Deferred artifact flush (debounced after writes, and at exit)
+# -----------------------------------------------------------------------------
+_FLUSH_LOCK = threading.Lock()       # guards the timer/dirty state
+_FLUSH_RUN_LOCK = threading.Lock()   # one flush at a time
+_flush_timer: Optional[threading.Timer] = None
+_dirty_since: Optional[float] = None
+
+def _flush_artifacts():
+    global _flush_timer, _dirty_since
+    with _FLUSH_LOCK:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        if _dirty_since is None:
+            return
+        _dirty_since = None
+    with _FLUSH_RUN_LOCK:
+        try:
+            _persist_tag_counts()   # before backup_all, so the state backup carries them
+            backup_all()  # persists CSV/XLSX + DB dump, then writes rotated backups
+            _write_parquet_cache()
+        except Exception as e:
+            log(f"Artifact flush failed: {e}", Fore.YELLOW)
+
+def _schedule_flush():
+    global _flush_timer, _dirty_since
+    with _FLUSH_LOCK:
+        now = time.time()
+        if _dirty_since is None:
+            _dirty_since = now
+        elif _flush_timer is not None and now - _dirty_since >= FLUSH_MAX_DELAY_SECONDS:
+            return  # let the pending timer fire instead of pushing it back again
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+        _flush_timer = threading.Timer(FLUSH_DELAY_SECONDS, _flush_artifacts)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+atexit.register(_flush_artifacts)
+
 # -----------------------------------------------------------------------------
 # Tagging helper
 # -----------------------------------------------------------------------------
+# tag -> keywords (substring match); list order is the output order
+TAG_RULES = [
+    ("#skipday", ["tired","lazy","rest","sleep"]),
+    ("#shortday", ["short","half","partial"]),
+    ("#savings", ["save","no spend","zero spend"]),
+    ("#food", ["food","coffee","drink","meal"]),
+    ("#travel", ["uber","bus","trip","travel","metro","rickshaw"]),
+]
+
+def _build_tag_automaton():
+    if ahocorasick is None:
+        return None
+    aho = ahocorasick.Automaton()
+    for tag, words in TAG_RULES:
+        for w in words:
+            aho.add_word(w, tag)
+    aho.make_automaton()
+    return aho
+
+_TAG_AUTOMATON = _build_tag_automaton()
+
 def auto_tag(note_text: Optional[str]) -> str:
     s = (note_text or "").lower()
-    tags = []
-    if any(x in s for x in ["tired","lazy","rest","sleep"]): tags.append("#skipday")
-    if any(x in s for x in ["short","half","partial"]): tags.append("#shortday")
-    if any(x in s for x in ["save","no spend","zero spend"]): tags.append("#savings")
-    if any(x in s for x in ["food","coffee","drink","meal"]): tags.append("#food")
-    if any(x in s for x in ["uber","bus","trip","travel","metro","rickshaw"]): tags.append("#travel")
-    seen = set(); out = []
-    for t in tags:
-        if t not in seen:
-            seen.add(t); out.append(t)
-    return " ".join(out)
+    if _TAG_AUTOMATON is not None:
+        # single pass over the note for all keywords
+        found = {tag for _, tag in _TAG_AUTOMATON.iter(s)}
+    else:
+        found = {tag for tag, words in TAG_RULES if any(x in s for x in words)}
+    return " ".join(tag for tag, _ in TAG_RULES if tag in found)
 
 # -----------------------------------------------------------------------------
 # Charts
 # -----------------------------------------------------------------------------
+# the daily chart redraws into one long-lived figure instead of creating one per entry
+_DAILY_FIG = plt.figure(figsize=(7,4))
+_CHART_LOCK = threading.Lock()
+
 def generate_daily_chart(date: str, total_income: int, total_spent: int, balance: int):
-    plt.figure(figsize=(7,4))
     labels = ['Total Income','Total Spent','Balance']
     values = [total_income, total_spent, balance]
-    bars = plt.bar(labels, values)
-    for b in bars:
-        y = b.get_height()
-        plt.text(b.get_x()+b.get_width()/2, y + max(1, 0.02*y), f"₹{int(y)}", ha='center')
-    plt.title(f"Daily Summary {date}")
-    plt.tight_layout()
     out = os.path.join(DAILY_FOLDER, f"{date}.png")
-    plt.savefig(out); plt.close()
+    with _CHART_LOCK:
+        _DAILY_FIG.clear()
+        ax = _DAILY_FIG.add_subplot(111)
+        bars = ax.bar(labels, values)
+        for b in bars:
+            y = b.get_height()
+            ax.text(b.get_x()+b.get_width()/2, y + max(1, 0.02*y), f"₹{int(y)}", ha='center')
+        ax.set_title(f"Daily Summary {date}")
+        _DAILY_FIG.tight_layout()
+        _DAILY_FIG.savefig(out)
     return out
 
 def generate_period_chart(df: pd.DataFrame, folder: str, period_name: str):
@@ -436,13 +1093,11 @@ def generate_period_chart(df: pd.DataFrame, folder: str, period_name: str):
     plt.tight_layout(); plt.savefig(filename); plt.close()
     return filename
 
-def generate_tag_cloud_from_series(series: pd.Series):
-    text = " ".join([str(x) for x in series if isinstance(x, str)])
-    if not text.strip(): return None
-    wc = WordCloud(width=800, height=400, background_color='white').generate(text)
-    out = os.path.join(TAGCLOUD_FOLDER, "tag_cloud.png")
-    wc.to_file(out)
-    return out
+def generate_tag_cloud_from_counts(counts: Optional[dict]):
+    if not counts: return None
+    wc = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(counts)
+    wc.to_file(TAG_CLOUD_FILE)
+    return TAG_CLOUD_FILE
 
 def optimized_chart_update(df: pd.DataFrame):
     if df.empty: return
@@ -453,80 +1108,221 @@ def optimized_chart_update(df: pd.DataFrame):
         generate_period_chart(df.tail(30), MONTHLY_FOLDER, "Monthly")
     if n >= 365 and n % 365 == 0:
         generate_period_chart(df.tail(365), YEARLY_FOLDER, "Yearly")
-    tags = df['Tags'].fillna("")
-    notes = df['Note'].fillna("")
-    series = pd.Series([t if t else n for t,n in zip(tags, notes)])
-    generate_tag_cloud_from_series(series)
+    # tag cloud from the running counts, redrawn every TAG_CLOUD_EVERY entries
+    if n % TAG_CLOUD_EVERY == 0 or not os.path.exists(TAG_CLOUD_FILE):
+        generate_tag_cloud_from_counts(tag_counts())
 
 # -----------------------------------------------------------------------------
 # Save entry (DB, Excel, CSV). NOTE: simplified schema (no starting balance, no additional)
 # -----------------------------------------------------------------------------
 def save_entry(date: str, pocket: int, extra: int, new_total_income: int, food: int, other: int,
                total_spent: int, balance: int, note: str, tags: str):
-    enc_note = enc_text(note)
-    enc_tags = enc_text(tags)
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("""INSERT INTO finance
-                 (date, pocket, extra, total_income, food, other, total_spent, balance, note, tags, created_at)
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-              (date, pocket, extra, new_total_income, food, other, total_spent, balance, enc_note, enc_tags, datetime.now().isoformat()))
-    conn.commit()
-    conn.close()
-    # Excel: ensure header exists
-    if not os.path.exists(EXCEL_FILE):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Daily_Records"
-        ws.append(CSV_COLUMNS)
-        wb.save(EXCEL_FILE)
-    wb = load_workbook(EXCEL_FILE)
-    ws = wb["Daily_Records"]
-    ws.append([date, pocket, extra, new_total_income, food, other, total_spent, balance, note, tags])
-    wb.save(EXCEL_FILE)
-    # CSV
-    _append_to_csv({
-        "Date": date,
-        "Pocket Money": pocket,
-        "Extra Income": extra,
-        "Total Income": new_total_income,
-        "Food & Drinks": food,
-        "Other Spending": other,
-        "Total Spent": total_spent,
-        "Balance": balance,
-        "Note": note,
-        "Tags": tags
-    })
-    # persist encrypted artifacts and backup
-    persist_csv_and_excel_encrypted()
-    persist_db_dump()
-    backup_all()
+    save_entries([(date, pocket, extra, new_total_income, food, other, total_spent, balance, note, tags)])
+
+def save_entries(entries: List[tuple]):
+    # entries: (date, pocket, extra, total_income, food, other, total_spent, balance, note, tags),
+    # i.e. CSV_COLUMNS order. One transaction, one CSV append, one deferred flush for the batch.
+    if not entries:
+        return
+    created_at = datetime.now().isoformat()
+    # note and tags share one ciphertext (raw token bytes) in the note column; tags stays NULL
+    rows = [(*e[:8], enc_fields({"note": e[8], "tags": e[9]}), None, created_at) for e in entries]
+    with _DB_LOCK:
+        _DB.execute("BEGIN")
+        try:
+            _DB.executemany("""INSERT INTO finance
+                               (date, pocket, extra, total_income, food, other, total_spent, balance, note, tags, created_at)
+                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+            _DB.execute("COMMIT")
+        finally:
+            _rollback_if_open()
+    # CSV, with the tag counts bumped under the same lock (see _TAG_COUNTS_LOCK)
+    with _TAG_COUNTS_LOCK:
+        _append_to_csv(entries)
+        _update_tag_counts(entries)
+    # Excel is regenerated from the CSV on export, not rewritten per entry; marked only once
+    # the rows are in the CSV, so an export rebuilding in between can't swallow the mark
+    _mark_excel_dirty()
+    # encrypted artifacts and backups are batched into a deferred flush
+    _schedule_flush()
 
 # -----------------------------------------------------------------------------
 # Load DataFrame from CSV or rebuild from DB
 # -----------------------------------------------------------------------------
+_PARQUET_SIG_KEY = b"v21.csv_signature"
+
+def _parquet_stamp(sig: Tuple[int, int]) -> bytes:
+    return ("%d:%d" % sig).encode("ascii")
+
+def _parquet_stamp_on_disk() -> Optional[bytes]:
+    # footer only; the row groups are not read
+    try:
+        return (pq.read_schema(PARQUET_FILE).metadata or {}).get(_PARQUET_SIG_KEY)
+    except Exception:
+        return None
+
+def _write_parquet_cache():
+    # stamped with the signature of the CSV it was built from, taken before the data is read:
+    # an append racing the build leaves a stamp that no longer matches. The data is the frame
+    # load_df parsed for exactly this CSV version, else the CSV file itself (never load_df,
+    # which may hand back a stale copy of this very cache).
+    if pq is None:
+        return  # no pyarrow: load_df keeps reading the CSV
+    sig = _csv_signature()
+    if sig is None or _parquet_stamp_on_disk() == _parquet_stamp(sig):
+        return
+    cached_sig, df = _DF_CACHE
+    if cached_sig != sig:
+        df = _read_csv(CSV_FILE)
+        if any(c not in df.columns for c in CSV_COLUMNS):
+            return  # broken CSV: load_df rebuilds it from the DB first
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[_PARQUET_SIG_KEY] = _parquet_stamp(sig)
+    pq.write_table(table.replace_schema_metadata(meta), PARQUET_FILE, compression="zstd")
+
+def _csv_signature() -> Optional[Tuple[int, int]]:
+    # (mtime_ns, size) of the CSV; changes whenever a row is appended or the CSV is rebuilt
+    try:
+        st = os.stat(CSV_FILE)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+_DF_CACHE: Tuple[Optional[Tuple[int, int]], Optional[pd.DataFrame]] = (None, None)
+
 def load_df() -> pd.DataFrame:
+    # parsed once per CSV version; callers get a copy so they can't mutate the cached frame
+    global _DF_CACHE
+    sig = _csv_signature()   # taken before parsing, so a concurrent append just forces a re-read
+    cached_sig, cached_df = _DF_CACHE
+    if sig is not None and sig == cached_sig:
+        return cached_df.copy()
+    df = _load_df_uncached()
+    if sig is not None:
+        _DF_CACHE = (sig, df)
+        return df.copy()
+    return df
+
+def _arrow_to_df(table) -> pd.DataFrame:
+    # numbers stay Arrow-backed; text columns come back as plain object columns with NaN for
+    # empty cells, as pd.read_csv gives them (the pages render and search them as before)
+    df = table.to_pandas(types_mapper=lambda t: None if pa.types.is_string(t) or pa.types.is_large_string(t)
+                         else pd.ArrowDtype(t))
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = df[c].where(df[c].notna(), np.nan)
+    return df
+
+def _read_csv(path: str) -> pd.DataFrame:
+    # pyarrow parses in parallel and hands back Arrow-backed numeric columns; pandas is the fallback
+    # (and the judge of broken files, so the rebuild-from-DB path still triggers)
+    if pa_csv is not None:
+        try:
+            table = pa_csv.read_csv(
+                path,
+                read_options=pa_csv.ReadOptions(block_size=1 << 20),
+                # Date stays text like with pandas; Note/Tags stay strings even when all empty
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={"Date": pa.string(), "Note": pa.string(), "Tags": pa.string()},
+                    strings_can_be_null=True,
+                ),
+            )
+            return _arrow_to_df(table)
+        except Exception:
+            pass
+    return pd.read_csv(path)
+
+def _read_parquet_cache() -> Optional[pd.DataFrame]:
+    # the Parquet cache is only trusted when it was built from exactly the current CSV
+    # (checked on the footer first, so a stale cache costs no table read)
+    sig = _csv_signature()
+    if pq is None or sig is None or _parquet_stamp_on_disk() != _parquet_stamp(sig):
+        return None
+    try:
+        table = pq.read_table(PARQUET_FILE)
+    except Exception:
+        return None
+    if (table.schema.metadata or {}).get(_PARQUET_SIG_KEY) != _parquet_stamp(sig):
+        return None   # rewritten between the two reads
+    return _arrow_to_df(table)
+
+def _load_df_uncached() -> pd.DataFrame:
+    df = _read_parquet_cache()
+    if df is not None:
+        return df
     if os.path.exists(CSV_FILE):
         try:
-            df = pd.read_csv(CSV_FILE)
+            df = _read_csv(CSV_FILE)
             needed = CSV_COLUMNS
             for c in needed:
                 if c not in df.columns:
                     rebuild_csv_from_db()
-                    df = pd.read_csv(CSV_FILE)
+                    df = _read_csv(CSV_FILE)
                     break
             return df
         except Exception:
             rebuild_csv_from_db()
             if os.path.exists(CSV_FILE):
-                return pd.read_csv(CSV_FILE)
+                return _read_csv(CSV_FILE)
             return pd.DataFrame(columns=CSV_COLUMNS)
     else:
         rebuild_csv_from_db()
         if os.path.exists(CSV_FILE):
-            return pd.read_csv(CSV_FILE)
+            return _read_csv(CSV_FILE)
         return pd.DataFrame(columns=CSV_COLUMNS)
 
+# -----------------------------------------------------------------------------
+# Analytics kernel (one pass over contiguous arrays; JIT-compiled when numba is present)
+# -----------------------------------------------------------------------------
+@njit(cache=True)
+def _analytics_core(income, spent, balance, month_codes):
+    # month_codes are dense 0..m-1 month ids per row (every id present)
+    sums_income = np.bincount(month_codes, income)
+    sums_spent = np.bincount(month_codes, spent)
+    # last row of each month: stable sort by month, take each group's tail
+    order = np.argsort(month_codes, kind="mergesort")
+    sorted_codes = month_codes[order]
+    is_last = np.append(sorted_codes[1:] != sorted_codes[:-1], True)
+    last_balance = balance[order[is_last]]
+    return (income.mean(), spent.mean(), balance.mean(), spent.sum(),
+            balance.argmax(), balance.argmin(), sums_income, sums_spent, last_balance)
+
+def _analytics_context(df: pd.DataFrame) -> dict:
+    def col(name):
+        return pd.to_numeric(df[name], errors="coerce").fillna(0).to_numpy(dtype=np.int64).astype(np.float64)
+    months, month_codes = np.unique(df["Date"].astype(str).str.slice(0, 7).to_numpy(dtype=str), return_inverse=True)
+    (avg_income, avg_spent, avg_balance, total_spending, best_idx, worst_idx,
+     sums_income, sums_spent, last_balance) = _analytics_core(
+        col("Total Income"), col("Total Spent"), col("Balance"), month_codes.astype(np.int64))
+    balance = col("Balance")
+    tag_series = df["Tags"].dropna().astype(str)
+    tags_flat = []
+    for t in tag_series:
+        tags_flat.extend([x for x in t.split() if x.startswith("#")])
+    tag_counts = pd.Series(tags_flat).value_counts().head(10).to_dict() if tags_flat else {}
+    by_month = pd.DataFrame({
+        "Month": months,
+        "Total Income": sums_income.astype(np.int64),
+        "Total Spent": sums_spent.astype(np.int64),
+        "Balance": last_balance.astype(np.int64),
+    })
+    return dict(
+        avg_income=float(avg_income),
+        avg_spent=float(avg_spent),
+        avg_balance=float(avg_balance),
+        total_days=len(df),
+        total_spending=int(total_spending),
+        best_date=df["Date"].iloc[best_idx],
+        best_bal=int(balance[best_idx]),
+        worst_date=df["Date"].iloc[worst_idx],
+        worst_bal=int(balance[worst_idx]),
+        tag_counts=tag_counts,
+        by_month_html=by_month.to_html(classes="table table-bordered table-sm", index=False),
+    )
+
+_ANALYTICS_CACHE: dict = {}   # csv signature -> template context
+
 # -----------------------------------------------------------------------------
 # Flask Routes
 # -----------------------------------------------------------------------------
@@ -648,7 +1444,15 @@ def search():
         df = load_df()
         if df.empty:
             return "<h3>No data available to search.</h3>"
-        result = df[df.apply(lambda row: row.astype(str).str.lower().str.contains(term).any(), axis=1)]
+        # one vectorized substring scan per column instead of a Python call per row
+        mask = pd.Series(False, index=df.index)
+        # (empty cells read as "nan", as they did in the row-by-row astype(str) scan)
+        nulls_match = term in "nan"
+        for col in df.columns:
+            mask |= df[col].astype(str).str.lower().str.contains(term, regex=False, na=False)
+            if nulls_match:
+                mask |= df[col].isna()
+        result = df[mask]
         if result.empty:
             return "<h3>No matching entries found.</h3>"
         return result.to_html(classes="table table-striped", index=False)
@@ -663,26 +1467,17 @@ def search():
 
 @app.route("/analytics")
 def analytics():
-    df = load_df()
-    if df.empty:
-        return "<h2>No data yet for analytics.</h2>"
-    for col in ["Total Income", "Food & Drinks", "Other Spending", "Total Spent", "Balance"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
-    avg_income = df["Total Income"].mean()
-    avg_spent = df["Total Spent"].mean()
-    avg_balance = df["Balance"].mean()
-    total_days = len(df)
-    total_spending = df["Total Spent"].sum()
-    best_row = df.loc[df["Balance"].idxmax()] if total_days else None
-    worst_row = df.loc[df["Balance"].idxmin()] if total_days else None
-    tag_series = df["Tags"].dropna().astype(str)
-    tags_flat = []
-    for t in tag_series:
-        tags_flat.extend([x for x in t.split() if x.startswith("#")])
-    tag_counts = pd.Series(tags_flat).value_counts().head(10).to_dict() if tags_flat else {}
-    df["Month"] = df["Date"].astype(str).str.slice(0, 7)
-    by_month = df.groupby("Month").agg({"Total Income":"sum","Total Spent":"sum","Balance":"last"}).reset_index()
-    by_month_html = by_month.to_html(classes="table table-bordered table-sm", index=False)
+    # recomputed only when the CSV changes
+    sig = _csv_signature()
+    ctx = _ANALYTICS_CACHE.get(sig) if sig is not None else None
+    if ctx is None:
+        df = load_df()
+        if df.empty:
+            return "<h2>No data yet for analytics.</h2>"
+        ctx = _analytics_context(df)
+        if sig is not None:
+            _ANALYTICS_CACHE.clear()
+            _ANALYTICS_CACHE[sig] = ctx
     return render_template_string("""
     <html>
     <head>
@@ -720,17 +1515,7 @@ def analytics():
     </html>
     """,
     version=VERSION_TAG,
-    avg_income=avg_income,
-    avg_spent=avg_spent,
-    avg_balance=avg_balance,
-    total_days=total_days,
-    total_spending=total_spending,
-    best_date=(best_row["Date"] if best_row is not None else "—"),
-    best_bal=(int(best_row["Balance"]) if best_row is not None else 0),
-    worst_date=(worst_row["Date"] if worst_row is not None else "—"),
-    worst_bal=(int(worst_row["Balance"]) if worst_row is not None else 0),
-    tag_counts=tag_counts,
-    by_month_html=by_month_html
+    **ctx
     )
 
 # -----------------------------------------------------------------------------
@@ -744,18 +1529,20 @@ def export_csv():
 
 @app.route("/export/excel")
 def export_excel():
-    # ensure excel exists
-    if not os.path.exists(EXCEL_FILE):
-        if os.path.exists(CSV_FILE):
-            try:
-                pd.read_csv(CSV_FILE).to_excel(EXCEL_FILE, index=False)
-            except Exception:
-                rebuild_csv_from_db()
-                pd.read_csv(CSV_FILE).to_excel(EXCEL_FILE, index=False)
-        else:
-            rebuild_csv_from_db()
-            if os.path.exists(CSV_FILE):
-                pd.read_csv(CSV_FILE).to_excel(EXCEL_FILE, index=False)
+    # (re)build excel from the CSV when missing or behind. The flag is cleared before the read,
+    # so a save landing mid-rebuild marks it dirty again; the workbook goes to a temp file
+    # renamed into place, so concurrent rebuilds never write EXCEL_FILE at the same time.
+    if not os.path.exists(EXCEL_FILE) or os.path.exists(EXCEL_DIRTY_FILE):
+        _clear_excel_dirty()
+        fd, tmp = _mkstemp_part(EXCEL_FILE)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                _write_excel(load_df(), f)
+            os.replace(tmp, EXCEL_FILE)
+        except BaseException:
+            _remove_quietly(tmp)
+            _mark_excel_dirty()
+            raise
     if os.path.exists(EXCEL_FILE):
         return send_file(EXCEL_FILE, as_attachment=True)
     return "Excel not found."
@@ -767,50 +1554,166 @@ def export_db():
         return send_file(DB_DUMP_ENC, as_attachment=True)
     return "DB dump not found."
 
-def secure_tarball_bytes(paths: List[str]) -> bytes:
-    buf = io.BytesIO()
-    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
-        for p in paths:
-            if os.path.exists(p):
-                arcname = os.path.relpath(p, start=DATA_DIR)
-                tar.add(p, arcname=arcname)
-    return enc_bytes(buf.getvalue())
+def write_secure_tarball(paths: List[str], out_path: str):
+    # tar -> AES-GCM stream -> out_path, in constant memory (nothing is built in RAM).
+    # Stored, not gzipped: every member is already ciphertext and would not shrink.
+    # Members are copied in 2 MiB reads instead of tarfile's 16 KiB ones.
+    with _StreamEncryptor(out_path) as enc:
+        with tarfile.open(fileobj=enc, mode="w", copybufsize=2 * 1024 * 1024) as tar:
+            for p in paths:
+                # hand-built header from one open+fstat: no gettarinfo(), no pwd/grp lookups
+                try:
+                    f = open(p, "rb", buffering=1 << 20)
+                except FileNotFoundError:
+                    continue
+                with f:
+                    st = os.fstat(f.fileno())
+                    ti = tarfile.TarInfo(name=os.path.relpath(p, start=DATA_DIR))
+                    ti.size = st.st_size
+                    ti.mtime = int(st.st_mtime)
+                    ti.mode = 0o600
+                    ti.type = tarfile.REGTYPE
+                    tar.addfile(ti, f)
+
+def _finance_rowcount() -> str:
+    # "max_rowid,count": moves on every insert (and on a restore that changes the table)
+    with _DB_LOCK:
+        max_id, count = _DB.execute("SELECT MAX(rowid), COUNT(*) FROM finance").fetchone()
+    return f"{max_id or 0},{count}"
+
+def _csv_artifacts_current(rowcount: str) -> bool:
+    # CSV/XLSX .enc files from the last export still describe the table
+    # (a missing CSV_ENC counts as stale)
+    if _is_stale(CSV_ENC, CSV_FILE) or not os.path.exists(XLSX_ENC):
+        return False
+    try:
+        with open(LAST_EXPORT_FILE, "r", encoding="utf-8") as f:
+            return f.read().strip() == rowcount
+    except FileNotFoundError:
+        return False
+
+def build_secure_export(job_id: Optional[str] = None) -> str:
+    # the job id keeps two exports started in the same second from sharing a file
+    ts = time.strftime("%Y-%m-%d_%H-%M-%S")
+    suffix = f"_{job_id}" if job_id else ""
+    out_path = os.path.join(DATA_DIR, f"secure_export_{ts}{suffix}.tar.enc")
+    # held until the tarball is written, so a deferred flush can't rewrite the artifacts
+    # underneath us; the dump and the CSV/XLSX artifacts are independent and run side by side
+    with _FLUSH_RUN_LOCK:
+        _persist_tag_counts()
+        rowcount = _finance_rowcount()
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            futs = [ex.submit(persist_db_dump)]
+            # no new rows since the last export: the CSV/XLSX artifacts are reused as-is
+            if not _csv_artifacts_current(rowcount):
+                futs.append(ex.submit(persist_csv_and_excel_encrypted))
+            for f in futs:
+                f.result()
+        with open(LAST_EXPORT_FILE, "w", encoding="utf-8") as f:
+            f.write(rowcount)
+        write_secure_tarball([DB_DUMP_ENC, CSV_ENC, XLSX_ENC, STATE_ENC], out_path)
+    return out_path
+
+# exports run off the request thread; the client polls the status URL until the file is ready
+_EXPORT_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="secure-export")
+_EXPORT_JOBS: dict = {}   # job id -> [Future[out_path], monotonic finish time (None while running)]
+_EXPORT_JOBS_LOCK = threading.Lock()
+
+def _mark_export_done(job_id: str):
+    with _EXPORT_JOBS_LOCK:
+        job = _EXPORT_JOBS.get(job_id)
+        if job is not None:
+            job[1] = time.monotonic()
+
+def _prune_export_jobs():
+    # jobs that finished more than EXPORT_JOB_TTL_SECONDS ago are forgotten and their tarballs
+    # deleted; until then the download can be resumed
+    now = time.monotonic()
+    with _EXPORT_JOBS_LOCK:
+        expired = [j for j, (_, done_at) in _EXPORT_JOBS.items()
+                   if done_at is not None and now - done_at > EXPORT_JOB_TTL_SECONDS]
+        dropped = [_EXPORT_JOBS.pop(j)[0] for j in expired]
+    for fut in dropped:
+        if fut.exception() is None:
+            _remove_quietly(fut.result())
 
 @app.route("/export/secure")
 def export_secure():
+    _prune_export_jobs()
+    job_id = uuid.uuid4().hex
+    with _EXPORT_JOBS_LOCK:
+        if sum(not fut.done() for fut, _ in _EXPORT_JOBS.values()) >= EXPORT_MAX_PENDING:
+            return "<h3>Too many secure exports in progress, try again shortly.</h3>", 429, {"Retry-After": "5"}
+        fut = _EXPORT_POOL.submit(build_secure_export, job_id)
+        _EXPORT_JOBS[job_id] = [fut, None]
+    # outside the lock: the callback runs inline if the job has already finished
+    fut.add_done_callback(lambda _: _mark_export_done(job_id))
+    status_url = url_for("export_secure_status", job_id=job_id)
+    return render_template_string("""
+    <h3>Secure export started.</h3>
+    <p><a href="{{ url }}">Download</a> (the link answers 202 until the file is ready)</p>
+    """, url=status_url), 202, {"Location": status_url}
+
+@app.route("/export/secure/status/<job_id>")
+def export_secure_status(job_id):
+    _prune_export_jobs()
+    job = _EXPORT_JOBS.get(job_id)
+    if job is None:
+        abort(404)
+    fut = job[0]
+    if not fut.done():
+        return "<h3>Secure export still running…</h3>", 202, {"Retry-After": "1"}
     try:
-        persist_db_dump()
-        persist_csv_and_excel_encrypted()
-        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        out_path = os.path.join(DATA_DIR, f"secure_export_{ts}.tar.gz.enc")
-        blob = secure_tarball_bytes([DB_DUMP_ENC, CSV_ENC, XLSX_ENC, STATE_ENC])
-        _write_file_secure(out_path, blob)
-        return send_file(out_path, as_attachment=True)
+        out_path = fut.result()
     except Exception as e:
         abort(500, f"Secure export failed: {e}")
+    # a path (not a file object) lets the server's wsgi.file_wrapper sendfile() it;
+    # conditional adds ETag/Range support for resumed downloads
+    return send_file(out_path, as_attachment=True, conditional=True,
+                     download_name=os.path.basename(out_path), max_age=0)
 
 # -----------------------------------------------------------------------------
 # CLI helpers
 # -----------------------------------------------------------------------------
 def decrypt_artifact(enc_path: str, out_path: str):
-    with open(enc_path, "rb") as f:
-        enc = f.read()
-    plain = dec_bytes(enc)
-    with open(out_path, "wb") as f:
-        f.write(plain)
+    # the artifact is mmapped rather than read, and v2 streams are decrypted record by record
+    # straight to the output fd, so neither side is ever held whole in memory. The plaintext
+    # goes to a temp file renamed over out_path at the end, so out_path may be enc_path itself
+    # and an existing out_path survives a failed decrypt.
+    fd, tmp = _mkstemp_part(out_path)
+    try:
+        with open(enc_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise InvalidToken("empty artifact")   # (and mmap can't map an empty file)
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                _write_decrypted(fd, mm)
+            finally:
+                mm.close()
+    except BaseException:
+        os.close(fd)
+        _remove_quietly(tmp)   # no partial plaintext from a truncated/tampered artifact
+        raise
+    os.close(fd)
+    os.replace(tmp, out_path)
     return out_path
 
+def _write_decrypted(fd: int, mm: mmap.mmap):
+    if mm[:len(_STREAM_MAGIC)] != _STREAM_MAGIC:
+        _write_all(fd, CIPHER.decrypt(bytes(mm)))   # legacy Fernet token
+        return
+    records = _iter_decrypted_stream(mm)
+    try:
+        for chunk in records:
+            _write_all(fd, chunk)
+    finally:
+        records.close()   # releases its view of mm before the unmap
+
 def restore_from_encrypted_dump(enc_path: str):
-    tmp = os.path.join(DATA_DIR, "__tmp_dump.sql")
-    decrypt_artifact(enc_path, tmp)
-    with open(tmp, "r", encoding="utf-8", errors="ignore") as f:
-        sql = f.read()
-    conn = sqlite3.connect(DB_FILE)
-    conn.executescript("DROP TABLE IF EXISTS finance;")
-    conn.executescript(sql)
-    conn.commit()
-    conn.close()
-    os.remove(tmp)
+    # decrypted in memory only: no plaintext dump ever touches the disk
+    with open(enc_path, "rb") as f:
+        plain = dec_bytes(f.read())
+    _restore_db(plain)
     rebuild_csv_from_db()
     persist_csv_and_excel_encrypted()
     return True